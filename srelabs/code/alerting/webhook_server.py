@@ -4,7 +4,7 @@ webhook_server.py
 Simple, verbose Flask webhook receiver for Alertmanager.
 
 - Binds to 127.0.0.1:5001 by default (change HOST/PORT below if needed)
-- Writes logs to stdout and /var/log/webhook_server.log
+- Writes logs to stdout and /var/log/webhook_server.log (override with WEBHOOK_LOG_FILE)
 - Disables Flask reloader so the process does not fork (important for systemd)
 - Writes a PID file to /var/run/webhook_server.pid
 """
@@ -21,7 +21,7 @@ from flask import Flask, request, jsonify
 HOST = "127.0.0.1"
 PORT = 5001
 PID_FILE = "/var/run/webhook_server.pid"
-LOG_FILE = "/var/log/webhook_server.log"
+LOG_FILE = os.environ.get("WEBHOOK_LOG_FILE", "/var/log/webhook_server.log")
 LOG_MAX_BYTES = 5 * 1024 * 1024
 LOG_BACKUP_COUNT = 3
 
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+alert_payloads.py
+Synthetic Alertmanager webhook payloads for benchmarking the webhook receiver.
+
+Payloads follow the Alertmanager webhook format (version "4") and are
+deterministic for a given alert count, so runs are comparable.
+
+Usage (standalone):
+  python3 alert_payloads.py 10     # print a payload with 10 alerts
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+
+ALERT_NAMES = ["InstanceDown", "HighCPUUsage", "HighMemoryUsage", "NginxDown", "DiskFillingUp"]
+SEVERITIES = ["critical", "warning"]
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def make_alert(i):
+    name = ALERT_NAMES[i % len(ALERT_NAMES)]
+    instance = f"10.0.{i // 250}.{i % 250 + 1}:9100"
+    return {
+        "status": "firing",
+        "labels": {
+            "alertname": name,
+            "instance": instance,
+            "job": "node_exporter",
+            "severity": SEVERITIES[i % len(SEVERITIES)],
+        },
+        "annotations": {
+            "summary": f"{name} on {instance}",
+            "description": f"{name} has been active on {instance} for more than 1 minute.",
+        },
+        "startsAt": (BASE_TIME + timedelta(seconds=i)).isoformat(),
+        "endsAt": "0001-01-01T00:00:00Z",
+        "generatorURL": f"http://prometheus:9090/graph?g0.expr=up%3D%3D0&alert={i}",
+        "fingerprint": f"{i:016x}",
+    }
+
+
+def make_payload(n_alerts):
+    """Build an Alertmanager webhook payload carrying n_alerts firing alerts."""
+    alerts = [make_alert(i) for i in range(n_alerts)]
+    return {
+        "version": "4",
+        "groupKey": '{}:{alertname="benchmark"}',
+        "truncatedAlerts": 0,
+        "status": "firing",
+        "receiver": "webhook",
+        "groupLabels": {"alertname": "benchmark"},
+        "commonLabels": {"job": "node_exporter"},
+        "commonAnnotations": {},
+        "externalURL": "http://alertmanager:9093",
+        "alerts": alerts,
+    }
+
+
+def make_body(n_alerts):
+    """Return the encoded JSON body for a payload with n_alerts alerts."""
+    return json.dumps(make_payload(n_alerts)).encode()
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    print(json.dumps(make_payload(count), indent=2))
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+bench.py
+Offline benchmark suite for the nginx exporter and the Alertmanager webhook.
+
+Everything runs on 127.0.0.1 against local stand-ins (fake_nginx.py and
+alert_payloads.py), so no nginx, Prometheus or Alertmanager is needed. The
+fake nginx, the exporter and the webhook each run in their own subprocess,
+so the load-generating client threads don't share a GIL with the server
+being measured.
+
+Benchmarks:
+ - parse/stub_status       stub_status parse throughput (parses/s)
+ - metrics/cN/*            /metrics latency (p50, p99) and scrapes/s under N concurrent scrapers
+ - webhook/aN/rps          webhook POST requests/s with N alerts per payload
+
+Each benchmark is run --repeat times and the median is reported and compared.
+p99 latencies are reported for information only and are not checked against
+the baseline: even with the median of several passes they are too noisy.
+
+Usage:
+  python3 bench.py                      # run and compare with baselines.json
+  python3 bench.py --save-baseline      # run and store results as the new baseline
+  python3 bench.py --threshold 0.1      # stricter check, for quiet dedicated hosts
+  python3 bench.py --only webhook       # run only benchmarks whose name starts with "webhook"
+
+Exit code is 1 when any checked benchmark regresses by more than the threshold,
+and 2 when a benchmark fails to run (nothing is reported or saved then).
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+from werkzeug.serving import make_server
+
+from alert_payloads import make_body
+from fake_nginx import FakeNginx, stub_status_page
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CODE_DIR = os.path.dirname(HERE)
+EXPORTER_PATH = os.path.join(CODE_DIR, "monitoring", "exporter", "nginx_exporter.py")
+WEBHOOK_PATH = os.path.join(CODE_DIR, "alerting", "webhook_server.py")
+
+DEFAULT_BASELINE = os.path.join(HERE, "baselines.json")
+# On a shared VM, whole runs of the same code can drift by 10-30% even with
+# medians, so this default only catches large regressions there. On a quiet,
+# dedicated host a tighter --threshold (e.g. 0.1) is usually workable.
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_REPEAT = 5
+
+# concurrency -> requests per client in one pass
+SCRAPE_CONCURRENCY = {1: 200, 8: 50}
+PAYLOAD_SIZES = [1, 10, 100]
+WEBHOOK_CONCURRENCY = 4
+WEBHOOK_REQUESTS_PER_CLIENT = 50
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class AppServer:
+    """Serve a Flask app on an ephemeral local port in a background thread."""
+
+    def __init__(self, app):
+        self.server = make_server("127.0.0.1", 0, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self.server.server_port
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def serve(kind):
+    """Subprocess entry point: run one server, print its port, stop when stdin closes."""
+    # werkzeug logs every request; that would dominate the measurements
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+
+    with open(os.devnull, "w") as devnull:
+        if kind == "nginx":
+            server = FakeNginx()
+            port = server.httpd.server_address[1]
+        else:
+            # both modules read their configuration from the environment at import time
+            path = EXPORTER_PATH if kind == "exporter" else WEBHOOK_PATH
+            module = load_module(f"bench_{kind}", path)
+            if kind == "webhook":
+                # keep the receiver's logging cost, but send it nowhere
+                for handler in module.logger.handlers:
+                    if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                        handler.setStream(devnull)
+            server = AppServer(module.app)
+            port = server.port
+
+        with server:
+            print(f"PORT {port}", flush=True)
+            # the parent closes our stdin (or dies) when it is done with us
+            sys.stdin.read()
+    return 0
+
+
+class ServerProcess:
+    """Start `bench.py --serve <kind>` and expose the base URL it listens on."""
+
+    def __init__(self, kind, env=None):
+        self.kind = kind
+        self.env = dict(os.environ, **(env or {}))
+        self.proc = None
+        self.base_url = None
+
+    def __enter__(self):
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", self.kind],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=self.env, text=True,
+        )
+        line = self.proc.stdout.readline()
+        if not line.startswith("PORT "):
+            self.proc.kill()
+            raise RuntimeError(f"{self.kind} server failed to start")
+        self.base_url = f"http://127.0.0.1:{int(line.split()[1])}"
+        return self
+
+    def __exit__(self, *exc):
+        self.proc.stdin.close()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc.stdout.close()
+
+
+def new_session():
+    session = requests.Session()
+    # never pick up proxy settings from the environment: everything stays local
+    session.trust_env = False
+    return session
+
+
+def run_clients(concurrency, per_client, fn):
+    """Call fn(session) per_client times from each of `concurrency` threads.
+
+    Returns (latencies in seconds, wall-clock seconds). If any call raises,
+    the remaining clients stop and the first error is re-raised here.
+    """
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(concurrency + 1)
+
+    def worker():
+        session = new_session()
+        local = []
+        barrier.wait()
+        try:
+            for _ in range(per_client):
+                if errors:
+                    break
+                t0 = time.perf_counter()
+                fn(session)
+                local.append(time.perf_counter() - t0)
+        except Exception as e:
+            with lock:
+                errors.append(e)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    if errors:
+        raise errors[0]
+    return latencies, time.perf_counter() - start
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100.0 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def result(value, unit, higher_is_better, check=True):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better, "check": check}
+
+
+# ---------- Benchmarks (one pass each) ----------
+
+def bench_parse(ctx, scale):
+    page = stub_status_page(291, 16630948, 16630948, 31070465, 6, 179, 106)
+    loops = 50000 * scale
+    best = float("inf")
+    for _ in range(3):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            ctx["exporter"].parse_stub_status(page)
+        best = min(best, time.perf_counter() - t0)
+    return {"parse/stub_status": result(loops / best, "parses/s", True)}
+
+
+def bench_metrics(ctx, scale):
+    results = {}
+    url = ctx["exporter_url"] + "/metrics"
+
+    def scrape(session):
+        r = session.get(url, timeout=5)
+        r.raise_for_status()
+        if "nginx_exporter_up 1" not in r.text:
+            raise RuntimeError("exporter could not read the fake stub_status page")
+
+    run_clients(1, 20, scrape)  # warm-up
+    for conc, per_client in SCRAPE_CONCURRENCY.items():
+        latencies, wall = run_clients(conc, per_client * scale, scrape)
+        prefix = f"metrics/c{conc}"
+        results[f"{prefix}/p50_ms"] = result(percentile(latencies, 50) * 1000, "ms", False)
+        results[f"{prefix}/p99_ms"] = result(percentile(latencies, 99) * 1000, "ms", False, check=False)
+        results[f"{prefix}/rps"] = result(len(latencies) / wall, "scrapes/s", True)
+    return results
+
+
+def bench_webhook(ctx, scale):
+    results = {}
+    url = ctx["webhook_url"] + "/"
+    headers = {"Content-Type": "application/json"}
+    for size in PAYLOAD_SIZES:
+        body = make_body(size)
+
+        def post(session, body=body):
+            r = session.post(url, data=body, headers=headers, timeout=5)
+            r.raise_for_status()
+
+        run_clients(1, 10, post)  # warm-up
+        latencies, wall = run_clients(WEBHOOK_CONCURRENCY, WEBHOOK_REQUESTS_PER_CLIENT * scale, post)
+        results[f"webhook/a{size}/rps"] = result(len(latencies) / wall, "req/s", True)
+    return results
+
+
+def run_repeated(bench, ctx, scale, repeat):
+    """Run one benchmark `repeat` times and keep the median of every metric."""
+    passes = [bench(ctx, scale) for _ in range(repeat)]
+    merged = {}
+    for name, first in passes[0].items():
+        merged[name] = dict(first, value=statistics.median(p[name]["value"] for p in passes))
+    return merged
+
+
+# ---------- Baselines ----------
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get("results", {})
+
+
+def save_baseline(path, results):
+    with open(path, "w") as f:
+        json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def regression(current, baseline):
+    """Fractional regression of current vs baseline (positive means worse)."""
+    base = baseline["value"]
+    if base <= 0:
+        return 0.0
+    if current["higher_is_better"]:
+        return (base - current["value"]) / base
+    return (current["value"] - base) / base
+
+
+def report(results, baseline, threshold):
+    failed = []
+    header = f"{'Benchmark':28s} | {'Value':>12s} | {'Unit':10s} | {'Baseline':>12s} | {'Change':>8s}"
+    print(header)
+    print("-" * len(header))
+    for name in sorted(results):
+        cur = results[name]
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:28s} | {cur['value']:12.2f} | {cur['unit']:10s} | {'-':>12s} | {'-':>8s}")
+            continue
+        reg = regression(cur, base)
+        mark = ""
+        if not cur.get("check", True):
+            mark = "  (info)"
+        elif reg > threshold:
+            failed.append(name)
+            mark = "  REGRESSION"
+        print(f"{name:28s} | {cur['value']:12.2f} | {cur['unit']:10s} | {base['value']:12.2f} | {-reg * 100:+7.1f}%{mark}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline exporter/webhook benchmark suite")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON file [%(default)s]")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed regression as a fraction, e.g. 0.1 = 10%% [%(default)s]")
+    parser.add_argument("--scale", type=int, default=1, help="multiply iteration counts for steadier numbers")
+    parser.add_argument("--only", default="", help="run only benchmarks whose name starts with this prefix")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="passes per benchmark; the median is compared [%(default)s]")
+    parser.add_argument("--serve", choices=["nginx", "exporter", "webhook"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        return serve(args.serve)
+    if args.repeat <= 0 or args.scale <= 0:
+        parser.error("--repeat and --scale must be positive")
+
+    try:
+        results = run_all(args)
+    except Exception as e:
+        # never report or save numbers from a run that did not complete
+        print(f"⛔ Benchmark run failed: {type(e).__name__}: {e}", file=sys.stderr)
+        return 2
+
+    print()
+    baseline = load_baseline(args.baseline)
+    failed = report(results, baseline, args.threshold)
+    print()
+
+    if args.save_baseline:
+        merged = dict(baseline)
+        merged.update(results)
+        save_baseline(args.baseline, merged)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+    if failed:
+        print(f"⛔ {len(failed)} benchmark(s) regressed by more than {args.threshold * 100:.0f}%: {', '.join(failed)}")
+        return 1
+    print(f"✅ No regressions beyond {args.threshold * 100:.0f}%.")
+    return 0
+
+
+def run_all(args):
+    """Start the servers and run every selected benchmark; returns the results."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, ServerProcess("nginx") as fake:
+        exporter_env = {"NGINX_STATUS_URL": fake.base_url + "/nginx_status"}
+        webhook_env = {"WEBHOOK_LOG_FILE": os.path.join(tmp, "webhook_server.log")}
+        with ServerProcess("exporter", exporter_env) as exporter_srv, \
+                ServerProcess("webhook", webhook_env) as webhook_srv:
+            ctx = {
+                # the parser is benchmarked in-process; no server is involved
+                "exporter": load_module("nginx_exporter", EXPORTER_PATH),
+                "exporter_url": exporter_srv.base_url,
+                "webhook_url": webhook_srv.base_url,
+            }
+            for prefix, bench in [
+                ("parse", bench_parse),
+                ("metrics", bench_metrics),
+                ("webhook", bench_webhook),
+            ]:
+                if args.only and not prefix.startswith(args.only) and not args.only.startswith(prefix):
+                    continue
+                print(f"[INFO] running {prefix} benchmarks ({args.repeat} passes)...")
+                measured = run_repeated(bench, ctx, args.scale, args.repeat)
+                results.update({k: v for k, v in measured.items() if k.startswith(args.only)})
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(main())
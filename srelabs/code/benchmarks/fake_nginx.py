@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+fake_nginx.py
+Local stand-in for an nginx stub_status endpoint, used by the benchmarks.
+
+Serves /nginx_status in the same format as nginx's stub_status module and
+advances the counters on every request, so the exporter sees realistic,
+monotonically increasing values without a real nginx running.
+
+Usage (standalone):
+  python3 fake_nginx.py            # serves on 127.0.0.1:8081
+  python3 fake_nginx.py --port 0   # pick a free port
+"""
+
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def stub_status_page(active, accepts, handled, requests_total, reading, writing, waiting):
+    """Render a stub_status page exactly as nginx prints it."""
+    return (
+        f"Active connections: {active} \n"
+        "server accepts handled requests\n"
+        f" {accepts} {handled} {requests_total} \n"
+        f"Reading: {reading} Writing: {writing} Waiting: {waiting} \n"
+    )
+
+
+class StubStatusState:
+    """Counters behind the fake page; advanced on every scrape."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.accepts = 0
+        self.handled = 0
+        self.requests = 0
+
+    def next_page(self):
+        with self.lock:
+            self.accepts += 3
+            # drop roughly one connection in a thousand, like a busy server would
+            self.handled += 3 if self.accepts % 3000 else 2
+            self.requests += 7
+            return stub_status_page(5, self.accepts, self.handled, self.requests, 0, 1, 4)
+
+
+class StubStatusHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path != "/nginx_status":
+            self.send_error(404)
+            return
+        body = self.server.state.next_page().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        # keep benchmark output clean
+        pass
+
+
+class FakeNginx:
+    """Run the fake stub_status server in a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), StubStatusHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = StubStatusState()
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/nginx_status"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake nginx stub_status server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    with FakeNginx(args.host, args.port) as fake:
+        print(f"Serving fake stub_status on {fake.url} (CTRL-C to stop)")
+        try:
+            fake.thread.join()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
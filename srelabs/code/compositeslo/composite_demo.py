@@ -3,11 +3,19 @@
 composite_slo_demo.py
 Demo script for calculating SLOs, Error Budgets, and Composite SLO
 for a retail application (frontend, payment API, backend, catalog).
+
+Usage:
+  python3 composite_demo.py
+  python3 composite_demo.py --sli-file sli_timeseries.csv   # used downtime from sli_extract.py
+  python3 composite_demo.py --sli-file sli_timeseries.csv --count-gaps   # minutes without log lines are downtime
 """
 
+import os
 import re
 import csv
 import random
+import argparse
+import importlib.util
 
 # Default configuration
 DEFAULT_WINDOW_DAYS = 30
@@ -19,6 +27,18 @@ DEFAULT_SLOS = {
 }
 
 SERVICES = list(DEFAULT_SLOS.keys())
+DEFAULT_BAD_MINUTE_THRESHOLD = 99.0
+
+SLI_EXTRACT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "error_budget_demo", "sli_extract.py"
+)
+
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 
 def parse_slo_input(raw: str):
@@ -54,6 +74,23 @@ def format_minutes(minutes: float):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Composite SLO demo")
+    parser.add_argument("--sli-file", help="per-minute SLI CSV from sli_extract.py to derive used downtime")
+    parser.add_argument("--bad-minute-threshold", type=float, default=DEFAULT_BAD_MINUTE_THRESHOLD,
+                        help="availability %% below which a minute counts as downtime [%(default)s]")
+    parser.add_argument("--count-gaps", action="store_true",
+                        help="count minutes with no log lines (between a service's first and last logged "
+                             "minute) as downtime; by default they count as available")
+    args = parser.parse_args()
+
+    bad_minute_frac = None
+    if args.sli_file:
+        parsed = parse_slo_input(str(args.bad_minute_threshold))
+        if not parsed:
+            print(f"❌ Invalid --bad-minute-threshold: {args.bad_minute_threshold}")
+            return
+        bad_minute_frac = parsed[1]
+
     print("\n🛒 Composite SLO Demo – Retail Application")
     print("Services:", ", ".join(SERVICES))
     print("This script will compute per-service SLOs, error budgets, and composite SLO.\n")
@@ -66,6 +103,24 @@ def main():
     total_minutes = window_days * 24 * 60
     print(f"Using window: {window_days} days = {total_minutes} minutes\n")
 
+    sli_downtime = None
+    if args.sli_file:
+        try:
+            sli_extract = load_module("sli_extract", SLI_EXTRACT_PATH)
+            sli_downtime = sli_extract.read_sli_downtime(args.sli_file, bad_minute_frac, window_days,
+                                                         count_gaps=args.count_gaps)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"❌ Could not read SLI file {args.sli_file}: {e}")
+            return
+        unmatched = sorted(set(sli_downtime) - set(SERVICES))
+        missing = [svc for svc in SERVICES if svc not in sli_downtime]
+        if unmatched:
+            print(f"⚠️ Services in {args.sli_file} that are not configured here (ignored): {', '.join(unmatched)}")
+        if missing:
+            print(f"⚠️ Configured services with no rows in {args.sli_file} (used downtime 0): {', '.join(missing)}")
+        if unmatched or missing:
+            print(f"   Configured services: {', '.join(SERVICES)}\n")
+
     # Collect SLOs
     slos_pct = {}
     slos_frac = {}
@@ -97,10 +152,22 @@ def main():
     print()
 
     # Used downtime
-    simulate = input("Simulate used downtime values? (y/N): ").lower().startswith("y")
+    if sli_downtime is not None:
+        simulate = False
+        print(f"Used downtime from {args.sli_file} (minutes below {args.bad_minute_threshold}% availability, "
+              f"last {window_days} days of the file)")
+        if args.count_gaps:
+            print("Minutes with no log lines are included as downtime.")
+        else:
+            print("Minutes with no log lines (e.g. a total outage) count as available; see --count-gaps.")
+    else:
+        simulate = input("Simulate used downtime values? (y/N): ").lower().startswith("y")
     used_downtime = {}
     for svc in SERVICES:
-        if simulate:
+        if sli_downtime is not None:
+            # services with no rows in the file were warned about above
+            used_downtime[svc] = sli_downtime.get(svc, 0.0)
+        elif simulate:
             used_downtime[svc] = round(random.uniform(0, error_budget[svc] * 1.5), 2)
         else:
             raw = input(f"Enter used downtime (minutes) for {svc} [0]: ") or "0"
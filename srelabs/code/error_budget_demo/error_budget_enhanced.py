@@ -7,17 +7,30 @@ Interactive error budget calculator and simulator for SRE training.
 Usage:
   python3 error_budget_interactive.py
   (optional) python3 error_budget_interactive.py --simulate
+  (optional) python3 error_budget_interactive.py --sli-file sli_timeseries.csv --service frontend
+  (optional) python3 error_budget_interactive.py --sli-file sli_timeseries.csv --count-gaps
 
 This script:
  - Accepts SLO (percentage like 99.9 or fraction like 0.999),
  - Accepts window length in days (e.g., 30),
- - Accepts used downtime in minutes (or simulates outages),
+ - Accepts used downtime in minutes (or simulates outages, or derives it from
+   a per-minute SLI file written by sli_extract.py),
  - Prints allowed downtime (error budget), remaining budget, burn %, and guidance.
 """
 
+import os
 import sys
 import argparse
 import random
+import importlib.util
+
+SLI_EXTRACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sli_extract.py")
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
 
 def parse_slo(inp: str):
     """Parse SLO input: accept percentages (e.g., '99.9') or fractions ('0.999')."""
@@ -65,6 +78,15 @@ def main():
     parser = argparse.ArgumentParser(description="Interactive Error Budget Calculator")
     parser.add_argument("--simulate", action="store_true",
                         help="Simulate random outage events instead of manual used_downtime input.")
+    parser.add_argument("--sli-file",
+                        help="Per-minute SLI CSV from sli_extract.py; used downtime = minutes below --bad-minute-threshold.")
+    parser.add_argument("--service", default="frontend",
+                        help="Service to read from --sli-file (default: frontend).")
+    parser.add_argument("--bad-minute-threshold", type=parse_slo, default=0.99,
+                        help="A minute counts as downtime when its availability is below this (default: 99).")
+    parser.add_argument("--count-gaps", action="store_true",
+                        help="Count minutes with no log lines (between the service's first and last logged "
+                             "minute) as downtime; by default they count as available.")
     args = parser.parse_args()
 
     print("\n== Error Budget Interactive Calculator (SRE Training) ==\n")
@@ -97,8 +119,26 @@ def main():
     total_minutes = days * 24 * 60
     error_budget_minutes = (1 - slo) * total_minutes
 
-    # used downtime input or simulation
-    if args.simulate:
+    # used downtime input, SLI file or simulation
+    if args.sli_file:
+        try:
+            sli_extract = load_module("sli_extract", SLI_EXTRACT_PATH)
+            downtime = sli_extract.read_sli_downtime(args.sli_file, args.bad_minute_threshold, days,
+                                                     count_gaps=args.count_gaps)
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Could not read SLI file {args.sli_file}: {e}")
+            sys.exit(1)
+        if args.service not in downtime:
+            print(f"Service '{args.service}' not found in {args.sli_file} (found: {', '.join(sorted(downtime)) or 'none'})")
+            sys.exit(1)
+        used_downtime = downtime[args.service]
+        print(f"\nUsed downtime from {args.sli_file} ({args.service}): {used_downtime:.0f} minutes "
+              f"below {args.bad_minute_threshold*100:.2f}% availability in the last {days} days of the file")
+        if args.count_gaps:
+            print("(minutes with no log lines are included as downtime)")
+        else:
+            print("(minutes with no log lines, e.g. a total outage, count as available; see --count-gaps)")
+    elif args.simulate:
         # Simple simulation: generate N events with random durations
         print("\n-- Simulation mode selected --")
         while True:
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+sli_extract.py
+Batch SLI extraction from nginx access logs (plain or gzip-rotated).
+
+Usage:
+  python3 sli_extract.py /var/log/nginx/access.log*
+  python3 sli_extract.py frontend=/logs/web/access.log* payment_api=/logs/pay/access.log*
+  python3 sli_extract.py --workers 8 --output sli_timeseries.csv /var/log/nginx/access.log*
+
+This script:
+ - Splits plain log files into byte-range chunks; each gzip file is one chunk
+   (gzip has no random access, so it is decompressed as a stream),
+ - Parses chunks in a process pool with a precompiled regex fast path,
+ - Merges per-minute request/error counts and request-time histograms,
+ - Writes one CSV row per (minute, service) that error_budget_enhanced.py
+   and composite_demo.py read with --sli-file.
+
+Expected log format is nginx "combined", optionally followed by $request_time:
+  log_format timed '$remote_addr - $remote_user [$time_local] "$request" '
+                   '$status $body_bytes_sent "$http_referer" "$http_user_agent" $request_time';
+Requests with a 5xx status count as errors. Lines without $request_time are
+counted for availability but left out of the latency histogram. A truncated
+or still-being-written .gz file is parsed up to the point where it breaks and
+reported as partial.
+
+A minute with no log lines gets no row at all, so a total outage (nginx down,
+nothing logged) looks like available time to a reader that only counts bad
+rows. read_sli_downtime() can count such missing minutes as downtime
+(count_gaps=True, --count-gaps in the readers), the same way slo_pipeline.py
+counts failed scrapes. Only use that for services that log every minute;
+for a quiet service an idle minute would be counted as downtime.
+"""
+
+import argparse
+import bisect
+import csv
+import glob
+import gzip
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+
+DEFAULT_SERVICE = "frontend"
+DEFAULT_OUTPUT = "sli_timeseries.csv"
+DEFAULT_CHUNK_MB = 64
+# Latency bucket upper bounds in seconds (Prometheus defaults, trimmed)
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# group 1: minute "10/Oct/2000:13:55", 2: UTC offset, 3: status, 4: request_time (optional)
+LINE_RE = re.compile(
+    rb'\S+ \S+ \S+ \[([^:\]]+:\d\d:\d\d):\d\d ([^\]]+)\] "[^"]*" (\d{3}) \S+'
+    rb'(?: "[^"]*" "[^"]*")?(?: ([\d.]+))?'
+)
+
+# Per-minute counter layout: [requests, errors, bucket_0 .. bucket_n, +Inf]
+N_FIELDS = 2 + len(LATENCY_BUCKETS) + 1
+
+
+def parse_lines(lines):
+    """Aggregate an iterable of raw log lines into {minute_key: counters}."""
+    match = LINE_RE.match
+    bisect_left = bisect.bisect_left
+    buckets = LATENCY_BUCKETS
+    minutes = {}
+    skipped = 0
+    for line in lines:
+        m = match(line)
+        if m is None:
+            skipped += 1
+            continue
+        minute, tz, status, rt = m.groups()
+        key = minute + b" " + tz
+        counts = minutes.get(key)
+        if counts is None:
+            counts = minutes[key] = [0] * N_FIELDS
+        counts[0] += 1
+        if status[0] == 53:  # b"5"
+            counts[1] += 1
+        if rt is not None:
+            try:
+                counts[2 + bisect_left(buckets, float(rt))] += 1
+            except ValueError:
+                pass
+    return minutes, skipped
+
+
+def read_range(path, start, end):
+    """Yield lines that *start* inside [start, end) of a plain file."""
+    with open(path, "rb") as f:
+        if start:
+            # a line straddling the boundary belongs to the previous chunk
+            f.seek(start - 1)
+            f.readline()
+        pos = f.tell()
+        while pos < end:
+            line = f.readline()
+            if not line:
+                break
+            pos += len(line)
+            yield line
+
+
+def read_gzip(path):
+    """Yield the lines of a gzip file as it is decompressed."""
+    with gzip.open(path, "rb") as f:
+        yield from f
+
+
+def guarded(lines, errors):
+    """Pass lines through; on a read error, stop and record it in `errors`."""
+    try:
+        yield from lines
+    except (EOFError, OSError, gzip.BadGzipFile) as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+
+def process_chunk(task):
+    """Worker entry point: parse one chunk and return its partial aggregate.
+
+    A read error (e.g. a truncated .gz) keeps whatever was parsed before it
+    and is returned as the last element instead of being raised.
+    """
+    service, path, start, end = task
+    errors = []
+    lines = read_gzip(path) if end is None else read_range(path, start, end)
+    minutes, skipped = parse_lines(guarded(lines, errors))
+    return service, path, minutes, skipped, errors[0] if errors else None
+
+
+def plan_chunks(inputs, chunk_bytes):
+    """Split (service, path) inputs into (service, path, start, end) tasks."""
+    tasks = []
+    for service, path in inputs:
+        if path.endswith(".gz"):
+            tasks.append((service, path, 0, None))
+            continue
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            tasks.append((service, path, start, min(start + chunk_bytes, size)))
+    return tasks
+
+
+def expand_inputs(args, default_service):
+    """Turn 'path' / 'service=path' arguments (globs allowed) into (service, path) pairs."""
+    inputs = []
+    for arg in args:
+        service, sep, pattern = arg.partition("=")
+        if not sep:
+            service, pattern = default_service, arg
+        paths = sorted(glob.glob(pattern)) or [pattern]
+        for path in paths:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"log file not found: {path}")
+            inputs.append((service, path))
+    return inputs
+
+
+def minute_to_utc(key, cache={}):
+    """b'10/Oct/2000:13:55 -0700' -> '2000-10-10T20:55:00Z'."""
+    iso = cache.get(key)
+    if iso is None:
+        dt = datetime.strptime(key.decode(), "%d/%b/%Y:%H:%M %z").astimezone(timezone.utc)
+        iso = cache[key] = dt.strftime("%Y-%m-%dT%H:%M:00Z")
+    return iso
+
+
+def merge(totals, service, minutes):
+    """Add a chunk's per-minute counters into totals; return the number of
+    lines skipped because their timestamp could not be parsed."""
+    skipped = 0
+    for key, counts in minutes.items():
+        try:
+            slot = (minute_to_utc(key), service)
+        except ValueError:
+            skipped += counts[0]
+            continue
+        acc = totals.get(slot)
+        if acc is None:
+            totals[slot] = list(counts)
+        else:
+            for i, v in enumerate(counts):
+                acc[i] += v
+    return skipped
+
+
+def write_csv(path, totals):
+    bucket_cols = [f"le_{b:g}" for b in LATENCY_BUCKETS] + ["le_+Inf"]
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["minute", "service", "requests", "errors", "availability"] + bucket_cols)
+        for (minute, service) in sorted(totals):
+            counts = totals[(minute, service)]
+            requests_total, errors = counts[0], counts[1]
+            availability = (requests_total - errors) / requests_total if requests_total else 1.0
+            # emit cumulative bucket counts, Prometheus histogram style
+            cumulative, running = [], 0
+            for v in counts[2:]:
+                running += v
+                cumulative.append(running)
+            writer.writerow([minute, service, requests_total, errors, f"{availability:.6f}"] + cumulative)
+
+
+def read_sli_downtime(path, threshold, window_days, count_gaps=False):
+    """Count, per service, the minutes of a CSV written by write_csv() whose
+    availability is below threshold (fraction).
+
+    Only the last window_days days count; the window ends at the newest minute
+    in the file. Minutes without a row (no log lines) count as available unless
+    count_gaps is set: then every missing minute between a service's first and
+    last row inside the window counts as downtime. Every service in the file
+    gets an entry, even if it has no rows inside the window.
+    """
+    rows = []
+    newest = None
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            minute = datetime.strptime(row["minute"], "%Y-%m-%dT%H:%M:%SZ")
+            rows.append((minute, row["service"], float(row["availability"]) < threshold))
+            if newest is None or minute > newest:
+                newest = minute
+
+    downtime = {svc: 0.0 for _, svc, _ in rows}
+    first, last, seen = {}, {}, {}
+    if newest is not None:
+        cutoff = newest - timedelta(days=window_days)
+        for minute, svc, bad in rows:
+            if minute <= cutoff:
+                continue
+            if bad:
+                downtime[svc] += 1.0
+            seen[svc] = seen.get(svc, 0) + 1
+            if svc not in first or minute < first[svc]:
+                first[svc] = minute
+            if svc not in last or minute > last[svc]:
+                last[svc] = minute
+    if count_gaps:
+        for svc in seen:
+            span = int((last[svc] - first[svc]).total_seconds() // 60) + 1
+            downtime[svc] += span - seen[svc]
+    return downtime
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract per-minute SLIs from nginx access logs")
+    parser.add_argument("logs", nargs="+", help="log files or globs, optionally prefixed with 'service='")
+    parser.add_argument("--service", default=DEFAULT_SERVICE,
+                        help="service name for logs given without a 'service=' prefix [%(default)s]")
+    parser.add_argument("--output", "-o", default=DEFAULT_OUTPUT, help="CSV output path [%(default)s]")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes [%(default)s]")
+    parser.add_argument("--chunk-mb", type=float, default=DEFAULT_CHUNK_MB,
+                        help="byte-range chunk size for plain files in MiB [%(default)s]")
+    args = parser.parse_args()
+    if args.chunk_mb <= 0 or args.workers <= 0:
+        parser.error("--chunk-mb and --workers must be positive")
+
+    try:
+        inputs = expand_inputs(args.logs, args.service)
+    except FileNotFoundError as e:
+        print("Error:", e, file=sys.stderr)
+        return 1
+
+    tasks = plan_chunks(inputs, max(1, int(args.chunk_mb * 1024 * 1024)))
+    print(f"Parsing {len(inputs)} file(s) as {len(tasks)} chunk(s) with {args.workers} worker(s)...")
+
+    totals = {}
+    skipped = 0
+    partial = {}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(process_chunk, task) for task in tasks]
+        for fut in as_completed(futures):
+            service, path, minutes, chunk_skipped, error = fut.result()
+            skipped += chunk_skipped + merge(totals, service, minutes)
+            if error:
+                partial[path] = error
+
+    write_csv(args.output, totals)
+    requests_total = sum(c[0] for c in totals.values())
+    errors = sum(c[1] for c in totals.values())
+    print(f"Requests: {requests_total}  Errors (5xx): {errors}  Unparsed lines: {skipped}")
+    for path in sorted(partial):
+        print(f"⚠️ Partial read of {path} ({partial[path]}); lines before the error were counted.")
+    print(f"📂 {len(totals)} minute/service rows written to {args.output}")
+    print("   Minutes without log lines have no row; use --count-gaps when reading the file "
+          "to count them as downtime.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+"""
+Opt-in load profile for clients that cache: each user re-requests pages with
+If-None-Match and gets 304s once it holds an ETag. Kept out of locust.py so the
+default load mix stays comparable with earlier runs.
+
+Usage:
+  locust -f locust_revalidate.py --host=http://<HOST>:5000
+  locust -f locust.py,locust_revalidate.py --host=http://<HOST>:5000   # mix both profiles
+"""
+from locust import HttpUser, task, between
+
+class RevalidatingUser(HttpUser):
+    """Behaves like a browser cache: re-requests with If-None-Match and gets 304s."""
+    wait_time = between(1, 5)
+
+    def on_start(self):
+        self.etags = {}
+
+    def conditional_get(self, path):
+        headers = {"If-None-Match": self.etags[path]} if path in self.etags else {}
+        with self.client.get(path, headers=headers, catch_response=True) as resp:
+            if resp.status_code in (200, 304):
+                if resp.headers.get("ETag"):
+                    self.etags[path] = resp.headers["ETag"]
+                resp.success()
+            else:
+                resp.failure(f"unexpected status {resp.status_code}")
+
+    @task
+    def index_page(self):
+        self.conditional_get("/")
+
+    @task
+    def api_data(self):
+        self.conditional_get("/api/data")
@@ -1,10 +1,16 @@
-from flask import Flask
-import socket, datetime, os
+from flask import Flask, Response, request
+import socket, datetime, os, sys, json, hashlib, signal, time
 
 app = Flask(__name__)
 start_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 restart_count = 0
 
+# Response cache settings: max-age for /api/data. "/" shows the hostname and
+# restart count, so it is always revalidated (no-cache) via its ETag instead.
+CACHE_MAX_AGE = int(os.environ.get("CACHE_MAX_AGE", "60"))
+# WORKERS > 1 serves from that many pre-forked processes sharing one listening socket
+WORKERS = int(os.environ.get("WORKERS", "1"))
+
 if os.path.exists('/app/restart_count.txt'):
     with open('/app/restart_count.txt', 'r') as f:
         restart_count = int(f.read()) + 1
@@ -15,19 +21,102 @@ else:
 with open('/app/restart_count.txt', 'w') as f:
     f.write(str(restart_count))
 
-@app.route('/')
-def home():
-    return f"""
+API_DATA = {"message": "This is sample API data", "status": "OK"}
+
+# route name -> (body bytes, mimetype, etag, cache-control); rebuilt by refresh_cache()
+_cache = {}
+
+def cache_body(key, body, mimetype, cache_control):
+    data = body.encode() if isinstance(body, str) else body
+    etag = hashlib.sha256(data).hexdigest()[:32]
+    _cache[key] = (data, mimetype, etag, cache_control)
+
+def refresh_cache():
+    """Precompute response bodies. Call again whenever their inputs change."""
+    cache_body("home", f"""
     <h2>Hello from Flask!</h2>
     Hostname: {socket.gethostname()}<br>
     Container start time: {start_time}<br>
     Restart count: {restart_count}
-    """
+    """, "text/html", "no-cache")
+    cache_body("api_data", json.dumps(API_DATA) + "\n", "application/json",
+               f"public, max-age={CACHE_MAX_AGE}")
+
+def cached_response(key):
+    body, mimetype, etag, cache_control = _cache[key]
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = Response(body, mimetype=mimetype)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = cache_control
+    return resp
+
+refresh_cache()
+
+@app.route('/')
+def home():
+    return cached_response("home")
 
 @app.route('/api/data')
 def api_data():
-    return {"message": "This is sample API data", "status": "OK"}
+    return cached_response("api_data")
 
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
+def serve_prefork(host, port, workers):
+    """Bind once, then fork workers that all accept on the same socket.
+
+    A worker that dies is replaced. If one dies within a second of starting
+    (a crash loop), all workers are stopped and the parent exits non-zero so
+    the container restart policy takes over.
+    """
+    from werkzeug.serving import make_server
+
+    server = make_server(host, port, app, threaded=True)
+    children = {}  # pid -> start time
+    stopping = False
 
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            # the parent handles Ctrl-C / SIGTERM and stops workers with SIGTERM
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            server.serve_forever()
+            os._exit(0)
+        children[pid] = time.monotonic()
+
+    def stop(signum=None, frame=None):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+    print(f"Serving on http://{host}:{port} with {workers} pre-forked workers")
+
+    exit_code = 0
+    while children:
+        pid, status = os.wait()
+        started = children.pop(pid, None)
+        if stopping or started is None:
+            continue
+        print(f"Worker {pid} exited (status {status})")
+        if time.monotonic() - started < 1.0:
+            print("Worker crashed right after starting; shutting down")
+            exit_code = 1
+            stop()
+        else:
+            spawn()
+    sys.exit(exit_code)
+
+if __name__ == '__main__':
+    if WORKERS > 1:
+        serve_prefork('0.0.0.0', 5000, WORKERS)
+    else:
+        app.run(host='0.0.0.0', port=5000)
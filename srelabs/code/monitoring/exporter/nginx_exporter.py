@@ -8,36 +8,32 @@ app = Flask(__name__)
 # inside compose, nginx service is reachable by hostname "nginx"
 NGINX_STATUS_URL = os.environ.get("NGINX_STATUS_URL", "http://nginx:80/nginx_status")
 
-@app.route("/metrics")
-def metrics():
-    try:
-        r = requests.get(NGINX_STATUS_URL, timeout=2)
-        r.raise_for_status()
-        lines = r.text.splitlines()
-    except Exception as e:
-        # When nginx status can't be read, expose a prometheus metric indicating failure
-        body = f'nginx_exporter_up 0\nnginx_exporter_error{{error="{type(e).__name__}"}} 1\n'
-        return Response(body, mimetype="text/plain")
+def parse_stub_status(text):
+    """Parse an nginx stub_status page into a dict of integer values.
 
+    Sections that are missing or malformed are skipped, so a partial page
+    still yields whatever could be read.
+    """
     # Parse expected stub_status format:
     # Active connections: 1
     # server accepts handled requests
     #  3 3 6
     # Reading: 0 Writing: 1 Waiting: 0
-    metrics = []
+    lines = text.splitlines()
+    stats = {}
 
     # Active connections
     try:
-        metrics.append('nginx_active_connections ' + lines[0].split()[2])
+        stats["active_connections"] = int(lines[0].split()[2])
     except Exception:
         pass
 
     # accepts handled requests
     try:
         accepts, handled, requests_total = map(int, lines[2].split())
-        metrics.append(f'nginx_connections_accepted {accepts}')
-        metrics.append(f'nginx_connections_handled {handled}')
-        metrics.append(f'nginx_http_requests_total {requests_total}')
+        stats["accepts"] = accepts
+        stats["handled"] = handled
+        stats["requests"] = requests_total
     except Exception:
         pass
 
@@ -45,12 +41,39 @@ def metrics():
     try:
         parts = lines[3].replace(":", "").split()
         # parts should be ['Reading', '0', 'Writing', '1', 'Waiting', '0']
-        metrics.append(f'nginx_reading {parts[1]}')
-        metrics.append(f'nginx_writing {parts[3]}')
-        metrics.append(f'nginx_waiting {parts[5]}')
+        stats["reading"] = int(parts[1])
+        stats["writing"] = int(parts[3])
+        stats["waiting"] = int(parts[5])
     except Exception:
         pass
 
+    return stats
+
+# stub_status key -> exposed metric name, in exposition order
+METRIC_NAMES = [
+    ("active_connections", "nginx_active_connections"),
+    ("accepts", "nginx_connections_accepted"),
+    ("handled", "nginx_connections_handled"),
+    ("requests", "nginx_http_requests_total"),
+    ("reading", "nginx_reading"),
+    ("writing", "nginx_writing"),
+    ("waiting", "nginx_waiting"),
+]
+
+@app.route("/metrics")
+def metrics():
+    try:
+        r = requests.get(NGINX_STATUS_URL, timeout=2)
+        r.raise_for_status()
+        text = r.text
+    except Exception as e:
+        # When nginx status can't be read, expose a prometheus metric indicating failure
+        body = f'nginx_exporter_up 0\nnginx_exporter_error{{error="{type(e).__name__}"}} 1\n'
+        return Response(body, mimetype="text/plain")
+
+    stats = parse_stub_status(text)
+    metrics = [f"{name} {stats[key]}" for key, name in METRIC_NAMES if key in stats]
+
     # exporter up metric
     metrics.append("nginx_exporter_up 1")
 
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+slo_pipeline.py
+Resident scrape-to-SLO stage: turns nginx exporter counters into live SLI,
+error budget and composite SLO gauges.
+
+Every SCRAPE_INTERVAL seconds each target's /metrics (nginx_exporter.py) is
+scraped and the counter deltas are folded into that service's budget state:
+ - a failed scrape, or nginx_exporter_up 0, counts the interval as downtime
+ - dropped connections (accepts - handled) count the interval as downtime
+   in proportion to the share of accepted connections that were dropped
+ - a counter that goes backwards is a reset (nginx restarted); the new value
+   is taken as the delta since the reset
+
+State lives in a ring of time buckets covering the rolling window, so each
+scrape updates it in O(1) and no batch recomputation is needed. Intervals are
+measured with a monotonic clock, so NTP steps are never counted as observed or
+bad time. Results are served on /metrics for Prometheus.
+
+Budget state is kept in memory only. When the process restarts (routine with
+restart: unless-stopped) the window starts empty and the remaining-budget
+gauges read "full" until downtime is observed again; use Prometheus history
+(or a long SLO window query) for anything that has to survive restarts.
+
+Configuration (environment):
+  TARGETS          service=url pairs, comma separated; service names must
+                   match [a-zA-Z_][a-zA-Z0-9_]* (default: nginx=http://exporter:9113/metrics)
+  SLOS             per-service SLO overrides, e.g. "nginx=99.95,api=99.9"
+  DEFAULT_SLO      SLO for services not in SLOS, percent or fraction (default 99.9)
+  WINDOW_DAYS      rolling window length (default 30)
+  SCRAPE_INTERVAL  seconds between scrapes (default 15)
+  PORT             port to serve /metrics on (default 9114)
+"""
+
+import os
+import re
+import threading
+import time
+
+import requests
+from flask import Flask, Response
+
+TARGETS = os.environ.get("TARGETS", "nginx=http://exporter:9113/metrics")
+SLOS = os.environ.get("SLOS", "")
+DEFAULT_SLO = os.environ.get("DEFAULT_SLO", "99.9")
+WINDOW_DAYS = float(os.environ.get("WINDOW_DAYS", "30"))
+SCRAPE_INTERVAL = float(os.environ.get("SCRAPE_INTERVAL", "15"))
+REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", "3"))
+PORT = int(os.environ.get("PORT", "9114"))
+
+# Rolling window resolution: the window is split into this many buckets
+WINDOW_BUCKETS = 720
+
+# service names are used as label values, so keep them to a safe charset
+SERVICE_NAME_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+app = Flask(__name__)
+
+
+def parse_slo(raw):
+    """Accept 99.9, 99.9% or 0.999 and return the SLO as a fraction."""
+    val = float(str(raw).strip().rstrip("%"))
+    frac = val / 100.0 if val > 1 else val
+    if not (0.0 < frac < 1.0):
+        raise ValueError(f"SLO must be between 0 and 100 percent (exclusive): {raw}")
+    return frac
+
+
+def parse_pairs(raw):
+    """'a=x,b=y' -> {'a': 'x', 'b': 'y'}"""
+    pairs = {}
+    for item in raw.split(","):
+        name, sep, value = item.strip().partition("=")
+        if sep:
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+def parse_exposition(text):
+    """Read unlabelled samples from Prometheus text format into {name: float}."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line[0] == "#" or "{" in line:
+            continue
+        name, _, value = line.rpartition(" ")
+        try:
+            samples[name] = float(value)
+        except ValueError:
+            pass
+    return samples
+
+
+def counter_delta(current, previous):
+    """Increase of a counter between two scrapes, treating a decrease as a reset."""
+    if previous is None:
+        return 0.0
+    if current < previous:
+        return current
+    return current - previous
+
+
+class ServiceBudget:
+    """Rolling-window SLI and error budget for one service, updated per scrape."""
+
+    COUNTERS = ("nginx_http_requests_total", "nginx_connections_accepted", "nginx_connections_handled")
+
+    def __init__(self, name, slo, window_seconds, buckets=WINDOW_BUCKETS):
+        self.name = name
+        self.slo = slo
+        self.window_seconds = window_seconds
+        self.bucket_seconds = window_seconds / buckets
+        # each bucket holds [observed_seconds, bad_seconds, requests]
+        self.ring = [[0.0, 0.0, 0.0] for _ in range(buckets)]
+        self.head = None  # absolute index of the newest bucket
+        self.observed = 0.0
+        self.bad = 0.0
+        self.requests = 0.0
+        self.last_counters = None
+        self.last_counters_time = None  # monotonic time of the last successful scrape
+        self.last_time = None
+        self.last_scrape_wall_time = None  # for display only
+        self.requests_per_second = 0.0
+        self.counter_resets = 0
+        self.scrape_failures = 0
+
+    def _advance(self, now):
+        """Rotate the ring up to `now`, dropping buckets that left the window."""
+        idx = int(now // self.bucket_seconds)
+        if self.head is None:
+            self.head = idx
+        # never write into a slot that belongs to an older bucket
+        idx = max(idx, self.head)
+        # at most len(ring) buckets are cleared, so a scrape stays O(1)
+        steps = min(idx - self.head, len(self.ring))
+        for i in range(1, steps + 1):
+            old = self.ring[(self.head + i) % len(self.ring)]
+            self.observed -= old[0]
+            self.bad -= old[1]
+            self.requests -= old[2]
+            old[0] = old[1] = old[2] = 0.0
+        self.head = idx
+        return self.ring[idx % len(self.ring)]
+
+    def _record(self, now, observed, bad, requests_delta):
+        bucket = self._advance(now)
+        bucket[0] += observed
+        bucket[1] += bad
+        bucket[2] += requests_delta
+        self.observed += observed
+        self.bad += bad
+        self.requests += requests_delta
+
+    def observe(self, now, samples, wall_time=None):
+        """Fold one scrape into the budget. `samples` is None when the scrape failed.
+
+        `now` must come from a monotonic clock (time.monotonic()); `wall_time`
+        is only reported, never used for accounting.
+        """
+        if wall_time is not None:
+            self.last_scrape_wall_time = wall_time
+        elapsed = 0.0 if self.last_time is None else max(0.0, now - self.last_time)
+        elapsed = min(elapsed, self.window_seconds)
+        self.last_time = now
+
+        if samples is None or samples.get("nginx_exporter_up") != 1.0 or \
+                any(c not in samples for c in self.COUNTERS):
+            self.scrape_failures += 1
+            self.requests_per_second = 0.0
+            self._record(now, elapsed, elapsed, 0.0)
+            return
+
+        counters = tuple(samples[c] for c in self.COUNTERS)
+        previous = self.last_counters or (None,) * len(counters)
+        if self.last_counters and any(c < p for c, p in zip(counters, previous)):
+            self.counter_resets += 1
+        requests_delta, accepts_delta, handled_delta = (
+            counter_delta(c, p) for c, p in zip(counters, previous)
+        )
+        # the deltas cover everything since the last successful scrape, which
+        # spans any failed scrapes in between, not just the last interval
+        span = 0.0 if self.last_counters_time is None else max(0.0, now - self.last_counters_time)
+        span = min(span, self.window_seconds)
+        self.last_counters = counters
+        self.last_counters_time = now
+
+        dropped = max(0.0, accepts_delta - handled_delta)
+        # failed intervals were already counted as bad, so only this interval
+        # (`elapsed`) is left to take the dropped share of the whole span
+        bad = min(elapsed, span * dropped / accepts_delta) if accepts_delta > 0 else 0.0
+        self.requests_per_second = requests_delta / span if span > 0 else 0.0
+        self._record(now, elapsed, bad, requests_delta)
+
+    @property
+    def availability(self):
+        return 1.0 - self.bad / self.observed if self.observed > 0 else 1.0
+
+    @property
+    def budget_minutes(self):
+        return (1 - self.slo) * self.window_seconds / 60.0
+
+    @property
+    def used_minutes(self):
+        return self.bad / 60.0
+
+
+class SLOPipeline:
+    """Per-service budgets plus the composite (AND of all services) view."""
+
+    def __init__(self, slos, window_seconds):
+        for name in slos:
+            if not SERVICE_NAME_RE.match(name):
+                raise ValueError(f"invalid service name {name!r}: must match {SERVICE_NAME_RE.pattern}")
+        self.lock = threading.Lock()
+        self.window_seconds = window_seconds
+        self.services = {name: ServiceBudget(name, slo, window_seconds) for name, slo in slos.items()}
+
+    def observe(self, name, now, samples, wall_time=None):
+        with self.lock:
+            self.services[name].observe(now, samples, wall_time)
+
+    def render(self):
+        lines = []
+        with self.lock:
+            composite_slo = 1.0
+            composite_availability = 1.0
+            for svc in self.services.values():
+                composite_slo *= svc.slo
+                composite_availability *= svc.availability
+                label = f'{{service="{svc.name}"}}'
+                lines += [
+                    f"slo_target_ratio{label} {svc.slo:.6f}",
+                    f"slo_availability_ratio{label} {svc.availability:.6f}",
+                    f"slo_error_budget_minutes{label} {svc.budget_minutes:.4f}",
+                    f"slo_error_budget_used_minutes{label} {svc.used_minutes:.4f}",
+                    f"slo_error_budget_remaining_minutes{label} {svc.budget_minutes - svc.used_minutes:.4f}",
+                    f"slo_requests_per_second{label} {svc.requests_per_second:.4f}",
+                    f"slo_window_requests{label} {svc.requests:.0f}",
+                    f"slo_counter_resets_total{label} {svc.counter_resets}",
+                    f"slo_scrape_failures_total{label} {svc.scrape_failures}",
+                ]
+                if svc.last_scrape_wall_time is not None:
+                    lines.append(f"slo_last_scrape_timestamp_seconds{label} {svc.last_scrape_wall_time:.3f}")
+            observed = max((s.observed for s in self.services.values()), default=0.0)
+            composite_budget = (1 - composite_slo) * self.window_seconds / 60.0
+            composite_used = (1 - composite_availability) * observed / 60.0
+            lines += [
+                f"slo_composite_target_ratio {composite_slo:.6f}",
+                f"slo_composite_availability_ratio {composite_availability:.6f}",
+                f"slo_composite_error_budget_minutes {composite_budget:.4f}",
+                f"slo_composite_error_budget_remaining_minutes {composite_budget - composite_used:.4f}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def scrape(session, url):
+    try:
+        r = session.get(url, timeout=REQUEST_TIMEOUT)
+        r.raise_for_status()
+        return parse_exposition(r.text)
+    except Exception:
+        return None
+
+
+def scrape_loop(pipeline, targets, interval):
+    session = requests.Session()
+    while True:
+        started = time.monotonic()
+        for name, url in targets.items():
+            samples = scrape(session, url)
+            pipeline.observe(name, time.monotonic(), samples, wall_time=time.time())
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+targets = parse_pairs(TARGETS)
+overrides = parse_pairs(SLOS)
+pipeline = SLOPipeline(
+    {name: parse_slo(overrides.get(name, DEFAULT_SLO)) for name in targets},
+    WINDOW_DAYS * 24 * 3600,
+)
+
+
+@app.route("/metrics")
+def metrics():
+    return Response(pipeline.render(), mimetype="text/plain")
+
+
+if __name__ == "__main__":
+    threading.Thread(target=scrape_loop, args=(pipeline, targets, SCRAPE_INTERVAL), daemon=True).start()
+    app.run(host="0.0.0.0", port=PORT)